@@ -6,6 +6,7 @@ import typing as t
 from python_multipart.multipart import parse_options_header
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.responses import StreamingResponse
 
 from ...exceptions import BentoMLException
 from ...exceptions import InvalidArgument
@@ -283,15 +284,42 @@ class Multipart(
 
         return res
 
+    def _find_alias(
+        self, obj: dict[str, t.Any], key: str, seen: t.Iterable[str]
+    ) -> str | None:
+        # Only the same descriptor instance is guaranteed to encode a value the
+        # same way; specs are lossy (e.g. JSON encoders) or absent altogether.
+        io_ = self._inputs[key]
+        for other in seen:
+            if obj[other] is obj[key] and self._inputs[other] is io_:
+                return other
+        return None
+
     async def to_http_response(
         self, obj: dict[str, t.Any], ctx: Context | None = None
     ) -> Response:
-        resps = await asyncio.gather(
-            *tuple(
-                io_.to_http_response(obj[key], ctx) for key, io_ in self._inputs.items()
-            )
+        # Fields holding the very same object with the same descriptor instance
+        # are encoded once and share the resulting part body.
+        pending: dict[str, t.Awaitable[Response]] = {}
+        aliases: dict[str, str] = {}
+        for key, io_ in self._inputs.items():
+            alias = self._find_alias(obj, key, pending)
+            if alias is not None:
+                aliases[key] = alias
+            else:
+                pending[key] = io_.to_http_response(obj[key], ctx)
+
+        resps = dict(zip(pending, await asyncio.gather(*pending.values())))
+        for key, alias in aliases.items():
+            resp = resps[alias]
+            if isinstance(resp, StreamingResponse):
+                # a streamed body can only be consumed once
+                resp = await self._inputs[key].to_http_response(obj[key], ctx)
+            resps[key] = resp
+
+        return await concat_to_multipart_response(
+            {key: resps[key] for key in self._inputs}, ctx
         )
-        return await concat_to_multipart_response(dict(zip(self._inputs, resps)), ctx)
 
     def validate_input_mapping(self, field: t.MutableMapping[str, t.Any]) -> None:
         if len(set(field) - set(self._inputs)) != 0:
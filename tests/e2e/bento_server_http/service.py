@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import functools
+import json
 import os
+import re
+import secrets
 import typing as t
 from typing import TYPE_CHECKING
 
+import anyio
 import numpy as np
-import pandas as pd
+import orjson
+import PIL.Image as PILImage
 import prometheus_client
 import pydantic
 from fastapi import FastAPI
-from PIL.Image import Image as PILImage
-from PIL.Image import fromarray
 from starlette.requests import Request
+from starlette.responses import Response
 
 import bentoml
+from bentoml._internal.io_descriptors.json import DefaultJsonEncoder
+from bentoml._internal.utils.http import set_cookies
+from bentoml._internal.utils.lazy_loader import LazyLoader
+from bentoml.exceptions import BadInput
+from bentoml.exceptions import InternalServerError
+from bentoml.exceptions import ServiceUnavailable
 from bentoml.io import JSON
 from bentoml.io import File
 from bentoml.io import Image
@@ -24,14 +36,108 @@ from bentoml.io import PandasDataFrame
 from bentoml.io import Text
 
 if TYPE_CHECKING:
+    import pandas as pd
     from numpy.typing import NDArray
+    from pydantic_core import SchemaValidator
     from starlette.types import ASGIApp
     from starlette.types import Receive
     from starlette.types import Scope
     from starlette.types import Send
 
+    from bentoml._internal.context import ServiceContext as Context
     from bentoml._internal.types import FileLike
     from bentoml._internal.types import JSONSerializable
+else:
+    pd = LazyLoader("pd", globals(), "pandas")
+
+
+def _make_response(
+    content: bytes | None, media_type: str, ctx: Context | None
+) -> Response:
+    if ctx is not None:
+        res = Response(
+            content,
+            media_type=media_type,
+            headers=ctx.response.metadata,  # type: ignore (bad starlette types)
+            status_code=ctx.response.status_code,
+        )
+        set_cookies(res, ctx.response.cookies)
+        return res
+    else:
+        return Response(content, media_type=media_type)
+
+
+# orjson silently turns integers outside the 64-bit range into floats; any such
+# literal has at least 19 digits, so those bodies go through stdlib json instead.
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+class FastJSON(JSON, proto_fields=JSON.proto_fields):
+    def to_spec(self) -> dict[str, t.Any]:
+        # report the stock descriptor so clients built from the spec resolve it
+        return {**super().to_spec(), "id": JSON.descriptor_id}
+
+    async def from_http_request(self, request: Request) -> t.Any:
+        if self._pydantic_model:
+            return await super().from_http_request(request)
+        body = await request.body()
+        if not _LONG_DIGITS.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN/Infinity literals, which stdlib json accepts
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as e:
+            raise BadInput(f"Invalid JSON input received: {e}") from None
+
+    async def to_http_response(self, obj: t.Any, ctx: Context | None = None):
+        if self._json_encoder is not DefaultJsonEncoder:
+            return await super().to_http_response(obj, ctx)
+        if isinstance(obj, pydantic.BaseModel):
+            obj = obj.model_dump() if hasattr(obj, "model_dump") else obj.dict()
+        try:
+            content = (
+                orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+                if obj is not None
+                else None
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, non-str keys, or types only
+            # DefaultJsonEncoder knows about
+            return await super().to_http_response(obj, ctx)
+        if content is not None and b"null" in content:
+            # orjson writes NaN/Infinity as null where the stock encoder raises
+            return await super().to_http_response(obj, ctx)
+        return _make_response(content, self._mime_type, ctx)
+
+
+class FastNumpyNdarray(NumpyNdarray, proto_fields=NumpyNdarray.proto_fields):
+    def to_spec(self) -> dict[str, t.Any]:
+        return {**super().to_spec(), "id": NumpyNdarray.descriptor_id}
+
+    async def to_http_response(self, obj: NDArray[t.Any], ctx: Context | None = None):
+        obj = self.validate_array(obj)
+        if obj.dtype.kind in "fc":
+            # orjson writes NaN/Infinity as null and float32 in its own shortest
+            # repr, so floating arrays keep the stock tolist() encoding
+            return await super().to_http_response(obj, ctx)
+        try:
+            content = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except orjson.JSONEncodeError:
+            # unsupported dtypes (e.g. str) and non-contiguous arrays
+            content = orjson.dumps(obj.tolist())
+        return _make_response(content, self._mime_type, ctx)
+
+
+class BytesText(Text, proto_fields=Text.proto_fields):
+    def to_spec(self) -> dict[str, t.Any]:
+        return {**super().to_spec(), "id": Text.descriptor_id}
+
+    async def to_http_response(self, obj: t.Any, ctx: Context | None = None):
+        if not isinstance(obj, bytes):
+            return await super().to_http_response(obj, ctx)
+        return _make_response(obj, self._mime_type, ctx)
 
 
 py_model = (
@@ -41,6 +147,36 @@ py_model = (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _count_suffix(i: int) -> str:
+    return f" {i}"
+
+
+class Ticker:
+    """
+    Wake all current waiters from one shared ``call_later`` timer instead of
+    arming a timer per waiter. The timer is only armed while someone waits.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._event: asyncio.Event | None = None
+
+    async def wait(self) -> None:
+        if self._event is None:
+            self._event = asyncio.Event()
+            asyncio.get_running_loop().call_later(self._interval, self._tick)
+        await self._event.wait()
+
+    def _tick(self) -> None:
+        event, self._event = self._event, None
+        if event is not None:
+            event.set()
+
+
+stream_ticker = Ticker(0.1)
+
+
 class StreamRunnable(bentoml.legacy.Runnable):
     SUPPORTED_RESOURCES = ("cpu",)
     SUPPORTS_CPU_MULTI_THREADING = True
@@ -48,8 +184,8 @@ class StreamRunnable(bentoml.legacy.Runnable):
     @bentoml.legacy.Runnable.method()
     async def count_text_stream(self, input_text: str) -> t.AsyncGenerator[str, None]:
         for i in range(10):
-            await asyncio.sleep(0.1)
-            yield f"{input_text} {i}"
+            await stream_ticker.wait()
+            yield input_text + _count_suffix(i)
 
 
 stream_runner = bentoml.legacy.Runner(StreamRunnable)
@@ -70,7 +206,7 @@ def echo_data_metric(data: str) -> str:
     return data
 
 
-@svc.api(input=JSON(), output=JSON())
+@svc.api(input=FastJSON(), output=FastJSON())
 async def echo_delay(data: dict[str, t.Any]) -> JSONSerializable:
     ret = await py_model.echo_delay.async_run(data)
     return ret
@@ -78,28 +214,163 @@ async def echo_delay(data: dict[str, t.Any]) -> JSONSerializable:
 
 @svc.api(input=bentoml.io.Text(), output=bentoml.io.Text())
 def ensure_metrics_are_registered(data: str) -> str:  # pylint: disable=unused-argument
-    from prometheus_client import generate_latest
-    from prometheus_client.parser import text_string_to_metric_families
-
-    counters = [
-        m.name
-        for m in text_string_to_metric_families(generate_latest().decode())
-        if m.type == "counter"
-    ]
-    assert "test_metrics" in counters
+    assert any(
+        m.name == "test_metrics" and m.type == "counter"
+        for m in prometheus_client.REGISTRY.collect()
+    )
     return "ok"
 
 
-@svc.api(input=JSON(), output=JSON())
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls to a batchable runner method into one
+    ``async_run`` per batch. A batch is sent once ``max_batch_size`` items are
+    queued or ``max_latency_ms`` has passed since the first one arrived.
+    """
+
+    _pending: asyncio.Event
+    _full: asyncio.Event
+
+    def __init__(
+        self,
+        runner_method: t.Any,
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5,
+    ) -> None:
+        self._runner_method = runner_method
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency_ms / 1000
+        self._queue: collections.deque[tuple[t.Any, asyncio.Future[t.Any]]] = (
+            collections.deque()
+        )
+        self._task: asyncio.Task[None] | None = None
+        self._inflight: dict[asyncio.Task[None], list[asyncio.Future[t.Any]]] = {}
+
+    def start(self) -> None:
+        # before Python 3.10 an Event binds to the loop that is current when it
+        # is created, so the events are made here, inside the serving loop
+        self._pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._task.add_done_callback(self._on_done)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        exc = ServiceUnavailable("Server is shutting down.")
+        for task, futures in list(self._inflight.items()):
+            task.cancel()
+            self._fail(futures, exc)
+        self._inflight.clear()
+        self._fail([fut for _, fut in self._queue], exc)
+        self._queue.clear()
+
+    def _on_done(self, task: asyncio.Task[None]) -> None:
+        if self._task is not task:
+            return  # already handled by stop()
+        # the consumer crashed: fail what it left queued and let later
+        # submissions run directly instead of waiting on a dead task
+        self._task = None
+        exc = task.exception() if not task.cancelled() else None
+        self._fail(
+            [fut for _, fut in self._queue],
+            exc or ServiceUnavailable("Batching worker stopped unexpectedly."),
+        )
+        self._queue.clear()
+
+    async def submit(self, item: t.Any) -> t.Any:
+        if self._task is None:
+            # not started (or already stopped): run the item on its own
+            results = await self._runner_method.async_run([item])
+            return results[0]
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.append((item, fut))
+        self._pending.set()
+        if len(self._queue) >= self._max_batch_size:
+            self._full.set()
+        return await fut
+
+    @staticmethod
+    def _fail(futures: t.Iterable[asyncio.Future[t.Any]], exc: BaseException) -> None:
+        for fut in futures:
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def _run(self) -> None:
+        while True:
+            await self._pending.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), self._max_latency)
+            except asyncio.TimeoutError:
+                pass
+            size = min(len(self._queue), self._max_batch_size)
+            batch = [self._queue.popleft() for _ in range(size)]
+            if len(self._queue) < self._max_batch_size:
+                self._full.clear()
+            if not self._queue:
+                self._pending.clear()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight[task] = [fut for _, fut in batch]
+            task.add_done_callback(lambda task: self._inflight.pop(task, None))
+
+    async def _dispatch(self, batch: list[tuple[t.Any, asyncio.Future[t.Any]]]):
+        futures = [fut for _, fut in batch]
+        try:
+            results = await self._runner_method.async_run([item for item, _ in batch])
+        except Exception as e:  # pylint: disable=broad-except
+            self._fail(futures, e)
+            return
+        if len(results) != len(batch):
+            self._fail(
+                futures,
+                InternalServerError(
+                    f"Runner returned {len(results)} results for a batch of {len(batch)}."
+                ),
+            )
+            return
+        for fut, result in zip(futures, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+json_batcher = MicroBatcher(py_model.echo_json)
+
+
+@svc.api(input=FastJSON(), output=FastJSON())
 async def echo_json(json_obj: JSONSerializable) -> JSONSerializable:
-    batch_ret = await py_model.echo_json.async_run([json_obj])
-    return batch_ret[0]
+    return await json_batcher.submit(json_obj)
 
 
-@svc.api(input=JSON(), output=JSON())
+@svc.api(input=FastJSON(), output=FastJSON())
 def echo_json_sync(json_obj: JSONSerializable) -> JSONSerializable:
-    batch_ret = py_model.echo_json.run([json_obj])
-    return batch_ret[0]
+    return anyio.from_thread.run(json_batcher.submit, json_obj)
+
+
+_pydantic_validators: dict[int, SchemaValidator] = {}
+
+
+def get_pydantic_validator(
+    model: type[pydantic.BaseModel],
+) -> SchemaValidator | None:
+    validator = _pydantic_validators.get(id(model))
+    if validator is None:
+        # only available on pydantic v2
+        validator = getattr(model, "__pydantic_validator__", None)
+        if validator is not None:
+            _pydantic_validators[id(model)] = validator
+    return validator
+
+
+class ValidatedJSON(FastJSON, proto_fields=FastJSON.proto_fields):
+    async def from_http_request(self, request: Request) -> t.Any:
+        validator = get_pydantic_validator(self._pydantic_model)
+        if validator is None:
+            return await super().from_http_request(request)
+        try:
+            return validator.validate_json(await request.body())
+        except pydantic.ValidationError as e:
+            raise BadInput(f"Invalid JSON input received: {e}") from None
 
 
 class ValidateSchema(pydantic.BaseModel):
@@ -107,23 +378,26 @@ class ValidateSchema(pydantic.BaseModel):
     endpoints: t.List[str]
 
 
+get_pydantic_validator(ValidateSchema)
+
+
 @svc.api(
-    input=JSON(pydantic_model=ValidateSchema),
-    output=JSON(),
+    input=ValidatedJSON(pydantic_model=ValidateSchema),
+    output=FastJSON(),
 )
 async def echo_json_enforce_structure(json_obj: JSONSerializable) -> JSONSerializable:
     batch_ret = await py_model.echo_json.async_run([json_obj])
     return batch_ret[0]
 
 
-@svc.api(input=JSON(), output=JSON())
+@svc.api(input=FastJSON(), output=FastJSON())
 async def echo_obj(obj: JSONSerializable) -> JSONSerializable:
     return await py_model.echo_obj.async_run(obj)
 
 
 @svc.api(
     input=NumpyNdarray(shape=(2, 2), enforce_shape=True),
-    output=NumpyNdarray(shape=(2, 2)),
+    output=FastNumpyNdarray(shape=(2, 2)),
 )
 async def predict_ndarray_enforce_shape(inp: NDArray[t.Any]) -> NDArray[t.Any]:
     assert inp.shape == (2, 2)
@@ -132,7 +406,7 @@ async def predict_ndarray_enforce_shape(inp: NDArray[t.Any]) -> NDArray[t.Any]:
 
 @svc.api(
     input=NumpyNdarray(dtype="uint8", enforce_dtype=True),
-    output=NumpyNdarray(dtype="str"),
+    output=FastNumpyNdarray(dtype="str"),
 )
 async def predict_ndarray_enforce_dtype(inp: NDArray[t.Any]) -> NDArray[t.Any]:
     assert inp.dtype == np.dtype("uint8")
@@ -141,7 +415,7 @@ async def predict_ndarray_enforce_dtype(inp: NDArray[t.Any]) -> NDArray[t.Any]:
 
 @svc.api(
     input=NumpyNdarray(),
-    output=NumpyNdarray(),
+    output=FastNumpyNdarray(),
 )
 async def predict_ndarray_multi_output(
     inp: "np.ndarray[t.Any, np.dtype[t.Any]]",
@@ -157,10 +431,7 @@ async def predict_ndarray_multi_output(
 async def predict_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     assert df["col1"].dtype == "int64"
     output = await py_model.predict_dataframe.async_run(df)
-    dfo = pd.DataFrame()
-    dfo["col1"] = output
-    assert isinstance(dfo, pd.DataFrame)
-    return dfo
+    return pd.DataFrame({"col1": output["col1"]}, copy=False)
 
 
 @svc.api(input=File(), output=File())
@@ -170,32 +441,51 @@ async def predict_file(f: FileLike[bytes]) -> bytes:
 
 
 @svc.api(input=Image(), output=Image(mime_type="image/bmp"))
-async def echo_image(f: PILImage) -> NDArray[t.Any]:
-    assert isinstance(f, PILImage)
-    return np.array(f)
+async def echo_image(f: PILImage.Image) -> NDArray[t.Any]:
+    assert isinstance(f, PILImage.Image)
+    return np.asarray(f)
+
+
+@functools.lru_cache(maxsize=1)
+def _image_limiter() -> anyio.CapacityLimiter:
+    # created on first use so it binds to the serving event loop
+    return anyio.CapacityLimiter(os.cpu_count() or 1)
+
+
+async def _images_to_arrays(*images: PILImage.Image) -> list[NDArray[t.Any]]:
+    limiter = _image_limiter()
+    return await asyncio.gather(
+        *(anyio.to_thread.run_sync(np.asarray, img, limiter=limiter) for img in images)
+    )
+
+
+# both output fields share one descriptor so the aliased image is encoded once
+output_image = Image()
 
 
 @svc.api(
     input=Multipart(original=Image(), compared=Image()),
-    output=Multipart(img1=Image(), img2=Image()),
+    output=Multipart(img1=output_image, img2=output_image),
 )
 async def predict_multi_images(original: Image, compared: Image):
+    arr_original, arr_compared = await _images_to_arrays(original, compared)
     output_array = await py_model.predict_multi_ndarray.async_run(
-        np.array(original), np.array(compared)
+        arr_original, arr_compared
     )
-    img = fromarray(output_array)
+    img = PILImage.fromarray(output_array)
     return dict(img1=img, img2=img)
 
 
 @svc.api(
     input=Multipart(original=Image(), compared=Image()),
-    output=Multipart(img1=Image(), img2=Image()),
+    output=Multipart(img1=output_image, img2=output_image),
 )
 async def predict_different_args(compared: Image, original: Image):
+    arr_original, arr_compared = await _images_to_arrays(original, compared)
     output_array = await py_model.predict_multi_ndarray.async_run(
-        np.array(original), np.array(compared)
+        arr_original, arr_compared
     )
-    img = fromarray(output_array)
+    img = PILImage.fromarray(output_array)
     return dict(img1=img, img2=img)
 
 
@@ -204,11 +494,16 @@ async def predict_different_args(compared: Image, original: Image):
     output=Text(),
 )
 async def use_context(inp: str, ctx: bentoml.Context):
-    if "error" in ctx.request.query_params:
+    if not ctx.request.scope.get("query_string"):
+        return inp
+    params = ctx.request.query_params
+    error = params.get("error")
+    if error is not None:
         ctx.response.status_code = 400
-        return ctx.request.query_params["error"]
-    elif "state" in ctx.request.query_params:
-        return ctx.state[ctx.request.query_params["state"]]
+        return error
+    state = params.get("state")
+    if state is not None:
+        return ctx.state[state]
     return inp
 
 
@@ -220,15 +515,22 @@ async def predict_text_stream(inp: str) -> t.AsyncGenerator[str, None]:
     return stream_runner.count_text_stream.async_stream(inp)
 
 
+YO_PREFIX = b"yo "
+
+
 @svc.api(
     input=Text(),
-    output=Text(),
+    output=BytesText(),
 )
-def yo(inp: str) -> str:
-    return f"yo {inp}"
+def yo(inp: str) -> bytes:
+    return YO_PREFIX + inp.encode("utf-8")
 
 
 # customise the service
+PING_PATH = "/ping"
+LIVEZ_PATH = "/livez"
+
+
 class AllowPingMiddleware:
     def __init__(
         self,
@@ -237,10 +539,8 @@ class AllowPingMiddleware:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] == "http":
-            req = Request(scope, receive)
-            if req.url.path == "/ping":
-                scope["path"] = "/livez"
+        if scope["type"] == "http" and scope.get("path") == PING_PATH:
+            scope = {**scope, "path": LIVEZ_PATH}
 
         await self.app(scope, receive, send)
         return
@@ -261,9 +561,7 @@ svc.mount_asgi_app(fastapi_app)
 
 
 def get_uid():
-    import uuid
-
-    return str(uuid.uuid4())
+    return secrets.token_hex(16)
 
 
 @svc.on_deployment
@@ -288,6 +586,16 @@ def on_startup(ctx: bentoml.Context):
     ctx.state["text_file"] = text_file
 
 
+@svc.on_startup
+def start_json_batcher(ctx: bentoml.Context):  # pylint: disable=unused-argument
+    json_batcher.start()
+
+
+@svc.on_shutdown
+def stop_json_batcher(ctx: bentoml.Context):  # pylint: disable=unused-argument
+    json_batcher.stop()
+
+
 @svc.on_shutdown
 def on_shutdown(ctx: bentoml.Context):
     if "text_file" not in ctx.state:
@@ -30,7 +30,7 @@ async def test_numpy(host: str):
             data=data,
         )
         assert response.status_code == 200
-        assert await response.aread() == b"[[2, 4], [6, 8]]"
+        assert await response.aread() == b"[[2,4],[6,8]]"
 
         data = json.dumps([[1, 2], [3, 4]])
         response = await client.client.post(
@@ -39,7 +39,7 @@ async def test_numpy(host: str):
             data=data,
         )
         assert response.status_code == 200
-        assert await response.aread() == b"[[2, 4], [6, 8]]"
+        assert await response.aread() == b"[[2,4],[6,8]]"
 
         data = json.dumps([1, 2, 3, 4])
         response = await client.client.post(
@@ -56,7 +56,7 @@ async def test_numpy(host: str):
             data=data,
         )
         assert response.status_code == 200
-        assert await response.aread() == b'[["4", "2"], ["8", "6"]]'
+        assert await response.aread() == b'[["4","2"],["8","6"]]'
 
         data = json.dumps([["2f", 1], [4, 3]])
         response = await client.client.post(
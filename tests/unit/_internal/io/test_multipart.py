@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+import typing as t
 from typing import TYPE_CHECKING
 
 import pytest
@@ -111,3 +112,63 @@ async def test_multipart_to_http_response(img_file: str):
         assert res
     except Exception as e:
         pytest.fail(f"Unexpected exception: {e}")
+
+
+@pytest.mark.asyncio
+async def test_multipart_to_http_response_shared_value(
+    img_file: str, monkeypatch: pytest.MonkeyPatch
+):
+    from bentoml.testing.utils import parse_multipart_form
+
+    image = Image()
+    text = Text()
+    descriptor = Multipart(
+        img1=image,
+        img2=image,
+        img3=Image(),
+        text1=text,
+        text2=text,
+    )
+    calls: list[str] = []
+    original = Image.to_http_response
+
+    async def to_http_response(self: Image, obj, ctx=None):
+        calls.append(self._mime_type)
+        return await original(self, obj, ctx)
+
+    monkeypatch.setattr(Image, "to_http_response", to_http_response)
+
+    img = PILImage.open(img_file)
+    res = await descriptor.to_http_response(
+        {"img1": img, "img2": img, "img3": img, "text1": "yo", "text2": "yo"}
+    )
+    # img2 reuses img1's part, img3 has its own descriptor instance
+    assert len(calls) == 2
+
+    form = await parse_multipart_form(headers=res.headers, body=res.body)
+    assert await form["img1"].read() == await form["img2"].read()
+    # streamed text parts are not shared
+    assert form["text1"] == form["text2"] == "yo"
+
+
+@pytest.mark.asyncio
+async def test_multipart_to_http_response_distinct_json_encoders():
+    import json
+
+    from bentoml.testing.utils import parse_multipart_form
+
+    class EncoderA(json.JSONEncoder):
+        def default(self, o: t.Any) -> t.Any:
+            return "A"
+
+    class EncoderB(json.JSONEncoder):
+        def default(self, o: t.Any) -> t.Any:
+            return "B"
+
+    descriptor = Multipart(a=JSON(json_encoder=EncoderA), b=JSON(json_encoder=EncoderB))
+    value = {"obj": object()}
+    res = await descriptor.to_http_response({"a": value, "b": value})
+
+    form = await parse_multipart_form(headers=res.headers, body=res.body)
+    assert form["a"] == '{"obj":"A"}'
+    assert form["b"] == '{"obj":"B"}'
@@ -18,9 +18,24 @@ if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest
 
 
+@pytest.fixture(scope="session", name="bentofile_yaml_bytes")
+def fixture_bentofile_yaml_bytes() -> bytes:
+    """The bentofile.yaml content used by reload_directory, rendered once per session."""
+    from bentoml._internal.bento.build_config import BentoBuildConfig
+    from bentoml._internal.utils.cattr import bentoml_cattr
+
+    build_config = BentoBuildConfig(
+        service="service.py:svc",
+        description="A mock service",
+    ).with_defaults()
+    return yaml.safe_dump(bentoml_cattr.unstructure(build_config)).encode("utf-8")
+
+
 @pytest.fixture(scope="function")
 def reload_directory(
-    request: FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+    request: FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+    bentofile_yaml_bytes: bytes,
 ) -> t.Generator[Path, None, None]:
     """
     This fixture will create an example bentoml working file directory
@@ -43,64 +58,50 @@ def reload_directory(
     ├── service.py
     └── train.py
     """
-    from bentoml._internal.bento.build_config import BentoBuildConfig
-    from bentoml._internal.utils.cattr import bentoml_cattr
-
     root = tmp_path_factory.mktemp("reload_directory")
-    # create a models directory
-    root.joinpath("models").mkdir()
 
     # enable this fixture to use with unittest.TestCase
     if request.cls is not None:
         request.cls.reload_directory = root
 
-    root_file = [
-        "README.md",
-        "requirements.txt",
-        "service.py",
-        "train.py",
-        "fname.ipynb",
-    ]
-
-    for f in root_file:
-        p = root.joinpath(f)
-        p.touch()
-    build_config = BentoBuildConfig(
-        service="service.py:svc",
-        description="A mock service",
-    ).with_defaults()
-    bentofile = root / "bentofile.yaml"
-    bentofile.touch()
-    with bentofile.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(bentoml_cattr.unstructure(build_config), f)
-
-    (root / ".bentoignore").write_text("*.rs\n")
-
+    files: dict[str, str] = {
+        "README.md": "",
+        "requirements.txt": "",
+        "service.py": "",
+        "train.py": "",
+        "fname.ipynb": "",
+        ".bentoignore": "*.rs\n",
+    }
+    # only leaf directories are listed, each created with a single mkdir -p
+    dirs = ["models"]
     custom_library = ["fdir", "fdir_one", "fdir_two"]
     for app in custom_library:
-        ap = root.joinpath(app)
-        ap.mkdir()
-        (ap / ".bentoignore").write_text("*.temp\n")
-        dir_files: list[tuple[str, list[t.Any]]] = [
-            ("README.md", []),
-            ("subdir", ["README.md", "app.py"]),
-            ("lib.rs", []),
-            ("app.py", []),
-        ]
-        for name, maybe_files in dir_files:
-            if maybe_files:
-                dpath = ap.joinpath(name)
-                dpath.mkdir()
-                for f in maybe_files:
-                    p = dpath.joinpath(f)
-                    p.touch()
-            else:
-                p = ap.joinpath(name)
-                p.touch()
+        dirs.append(f"{app}/subdir")
+        files.update(
+            {
+                f"{app}/.bentoignore": "*.temp\n",
+                f"{app}/README.md": "",
+                f"{app}/subdir/README.md": "",
+                f"{app}/subdir/app.py": "",
+                f"{app}/lib.rs": "",
+                f"{app}/app.py": "",
+            }
+        )
+
+    for d in dirs:
+        root.joinpath(d).mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        root.joinpath(name).write_text(content, encoding="utf-8")
+    root.joinpath("bentofile.yaml").write_bytes(bentofile_yaml_bytes)
 
     yield root
 
 
+class NoopModel:
+    def predict(self, data: t.Any) -> t.Any:
+        return data
+
+
 @pytest.fixture(scope="session")
 def simple_service() -> bentoml.legacy.Service:
     """
@@ -111,10 +112,6 @@ def simple_service() -> bentoml.legacy.Service:
     """
     from bentoml.io import Text
 
-    class NoopModel:
-        def predict(self, data: t.Any) -> t.Any:
-            return data
-
     with bentoml.models._create(  # type: ignore
         "python_function",
         context=TEST_MODEL_CONTEXT,